@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """Bounded in-process LRU cache for predictions of deterministic models
+
+    Entries are keyed on a canonical hash of the validated prediction request
+    and optionally expire after a time-to-live.
+    A max_size of 0 disables the cache altogether.
+    """
+    def __init__(self, max_size=1024, ttl=None):
+        """Initialize the cache
+
+        Args:
+            max_size (int): maximum number of cached predictions, 0 disables caching
+            ttl (float): seconds a cached prediction stays valid, None means no expiry
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Build a cache configured by the KONAN_PREDICTION_CACHE_* environment variables"""
+        max_size = int(os.environ.get("KONAN_PREDICTION_CACHE_SIZE", 1024))
+        ttl = os.environ.get("KONAN_PREDICTION_CACHE_TTL")
+        return cls(max_size=max_size, ttl=float(ttl) if ttl else None)
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    @staticmethod
+    def make_key(req):
+        """Hash a pydantic request independently of field ordering"""
+        payload = json.dumps(req.dict(), sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_or_compute(self, req, compute):
+        """Return the cached prediction for req, calling compute(req) on a miss
+
+        Args:
+            req (BaseModel): validated prediction request
+            compute (callable): function computing the prediction of a request
+
+        Returns:
+            the cached or freshly computed prediction
+        """
+        if not self.enabled:
+            return compute(req)
+
+        key = self.make_key(req)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or now - entry[0] < self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # compute outside the lock so concurrent requests aren't serialized
+        prediction = compute(req)
+
+        # the entry's lifetime starts once the prediction is available
+        with self._lock:
+            self._entries[key] = (time.monotonic(), prediction)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return prediction
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
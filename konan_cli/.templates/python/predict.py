@@ -27,6 +27,10 @@ class prediction_response(BaseModel):
 
 
 class Model:
+    # Set to True if your model is deterministic, i.e. the same request always yields the same prediction.
+    # Repeated requests are then served from an in-process cache instead of calling predict again
+    cache_predictions = False
+
     def __init__(self, artifacts_base_path):
         """Initialize your model and artifacts here
 
@@ -1,6 +1,8 @@
 from konan_sdk.konan_service.services import KonanService
 from konan_sdk.konan_service.models import KonanServiceBaseModel
 
+from konan_prediction_cache import PredictionCache
+
 from predict import prediction_request, prediction_response, Model, evaluation_request, evaluation_response
 
 
@@ -41,6 +43,12 @@ class MyModel(KonanServiceBaseModel):
         self.loaded_model = pickle.load(open(f"{Konan_Constants.MODELS_DIR}/model.pickle", 'rb'))
         """
         self.user_model = Model('/app/artifacts')
+        # predictions are cached only if the user's Model in predict.py sets cache_predictions = True,
+        # sized by the KONAN_PREDICTION_CACHE_SIZE and KONAN_PREDICTION_CACHE_TTL environment variables
+        if getattr(self.user_model, "cache_predictions", False):
+            self.cache = PredictionCache.from_env()
+        else:
+            self.cache = PredictionCache(max_size=0)
 
     def predict(self, req: prediction_request) -> prediction_response:
         """Makes an intelligent prediction
@@ -51,7 +59,7 @@ class MyModel(KonanServiceBaseModel):
         Returns:
             MyPredictionResponse: this will be the response returned by the API
         """
-        return self.user_model.predict(req)
+        return self.cache.get_or_compute(req, self.user_model.predict)
 
     def evaluate(self, req: evaluation_request) -> evaluation_response:
         """Evaluates the model based on passed predictions and their ground truths
@@ -68,3 +76,9 @@ class MyModel(KonanServiceBaseModel):
 
 
 app = KonanService(MyPredictionRequest, MyPredictionResponse, MyModel)
+
+
+@app.app.get("/cache/stats")
+def cache_stats() -> dict:
+    """Reports the prediction cache hit/miss counters"""
+    return app.model.cache.stats()
@@ -2,3 +2,7 @@ import os
 
 LOCAL_CONFIG_FILE_NAME = "model.config.json"
 DEFAULT_LOCAL_CFG_PATH = f'{os.getcwd()}/{LOCAL_CONFIG_FILE_NAME}'
+
+DEFAULT_BASE_IMAGE = "python:3.7-slim-stretch"
+# written by older versions of `konan init` but never used for building, the tag doesn't exist
+LEGACY_DEFAULT_BASE_IMAGE = "python:3.10-slim-stretch"
@@ -5,7 +5,7 @@ import click
 import docker
 import jwt
 import requests
-from docker.errors import ImageNotFound
+from docker.errors import APIError, ImageNotFound
 from konan_sdk.sdk import KonanSDK
 from requests import HTTPError
 
@@ -106,8 +106,13 @@ def show(ctx):
 @click.option('--api-key', 'api_key',
               help="API key for the logged in user, can be obtained from https://auth.konan.ai/api/no/idea",
               type=click.STRING)
+@click.option('--registry-mirror', 'registry_mirror',
+              help="local registry mirror to pull docker hub base images through, ex: localhost:5000",
+              type=click.STRING)
+@click.option('--no-registry-mirror', 'no_registry_mirror', help="stop pulling base images through a registry mirror",
+              is_flag=True)
 @click.pass_context
-def set(ctx, docker_path, api_key):
+def set(ctx, docker_path, api_key, registry_mirror, no_registry_mirror):
     """
     Modify the current konan config
     """
@@ -115,6 +120,10 @@ def set(ctx, docker_path, api_key):
         global_config.docker_path = docker_path
     if api_key:
         global_config.api_key = api_key
+    if registry_mirror:
+        global_config.registry_mirror = registry_mirror
+    if no_registry_mirror:
+        global_config.registry_mirror = None
 
     global_config.save()
 
@@ -145,10 +154,29 @@ def init(language, override):
 @konan.command()
 @click.option('--image-name', 'image_name', help="name of the image to generate", required=True)
 @click.option(
-    '--dry-run', 'dry_run', help="generate build files only without building the image", is_flag=True, required=False
+    '--dry-run', 'dry_run', help="generate build files only without building the image or updating the config",
+    is_flag=True, required=False
+)
+@click.option(
+    '--pin-base-image', 'pin_base_image',
+    help="pin the base image to its current digest in model.config.json, re-pins if already pinned",
+    is_flag=True, required=False
+)
+@click.option(
+    '--unpin-base-image', 'unpin_base_image', help="remove the pinned base image digest from model.config.json",
+    is_flag=True, required=False
+)
+@click.option(
+    '--wheelhouse',
+    help="directory of wheels to install from instead of the network for this build, must contain wheels for pip, "
+         "setuptools, uvicorn and all requirements.txt packages including their dependencies",
+    type=click.Path(exists=True, file_okay=False), required=False
+)
+@click.option(
+    '--offline', help="only use locally available base images, never pull", is_flag=True, required=False
 )
 @click.option('--verbose', help="increase the verbosity of messages", is_flag=True, required=False)
-def build(image_name, dry_run, verbose):
+def build(image_name, dry_run, pin_base_image, unpin_base_image, wheelhouse, offline, verbose):
     """
     Packages your model as a docker image.
     """
@@ -171,15 +199,56 @@ def build(image_name, dry_run, verbose):
     else:
         local_config = LocalConfig(**LocalConfig.load(DEFAULT_LOCAL_CFG_PATH), new=False)
 
+    if pin_base_image and unpin_base_image:
+        click.echo("The --pin-base-image and --unpin-base-image flags can't be used together.")
+        return
+    if dry_run and (pin_base_image or unpin_base_image):
+        click.echo("The --pin-base-image and --unpin-base-image flags can't be used with --dry-run.")
+        return
+
+    if unpin_base_image or pin_base_image:
+        local_config.unpin_base_image()
+    elif local_config.has_stale_pin:
+        click.echo(
+            f"WARNING: base image was pinned for {local_config.pinned_base_image['base_image']} "
+            f"but base_image is now {local_config.base_image}, ignoring the pin. "
+            "Run konan build with --pin-base-image to pin the new base image."
+        )
+        local_config.unpin_base_image()
+
     # generate build files
-    local_config.build_context()
+    local_config.build_context(wheelhouse=wheelhouse)
 
     # exit if dry run
     if dry_run:
         return
 
+    # pull base image only if it isn't available locally yet
+    base_image_reference = local_config.base_image_reference(global_config.registry_mirror)
+    try:
+        base_image = local_config.resolve_base_image(
+            registry_mirror=global_config.registry_mirror, pin=pin_base_image, offline=offline
+        )
+    except APIError as e:
+        if offline:
+            click.echo(
+                f"Base image {base_image_reference} not found locally. "
+                "Re-run the command without the --offline flag to pull it."
+            )
+        else:
+            click.echo(
+                f"Failed to pull base image {base_image_reference}: {e.explanation or e}. "
+                "Make sure the base_image in model.config.json exists and the registry mirror, if set, is reachable."
+            )
+        return
+    if pin_base_image:
+        if local_config.base_image_digest:
+            click.echo(f"Base image pinned to {base_image}.")
+        else:
+            click.echo(f"WARNING: base image {base_image} has no registry digest and could not be pinned.")
+
     # build image
-    image, build_logs = local_config.build_image(image_tag=image_name)
+    image, build_logs = local_config.build_image(image_tag=image_name, base_image=base_image, wheelhouse=wheelhouse)
     click.echo(f"Image {image_name} built successfully.")
 
     # save image tag and config file
@@ -9,9 +9,10 @@ import sys
 from pathlib import Path
 
 import requests
+from docker.errors import ImageNotFound
 from starlette.status import HTTP_200_OK
 
-from konan_cli.constants import DEFAULT_LOCAL_CFG_PATH
+from konan_cli.constants import DEFAULT_LOCAL_CFG_PATH, DEFAULT_BASE_IMAGE, LEGACY_DEFAULT_BASE_IMAGE
 from .__init__ import __version__
 
 
@@ -28,6 +29,7 @@ class GlobalConfig:
         self.organization_id = kwargs[0].get('organization_id')
         self.token_name = kwargs[0].get('token_name')
         self.token_password = kwargs[0].get('token_password')
+        self.registry_mirror = kwargs[0].get('registry_mirror')
 
         self._version = __version__
 
@@ -100,16 +102,19 @@ class GlobalConfig:
 
 class LocalConfig:
     def __init__(
-        self, language, global_config=None, override=None, base_image="python:3.10-slim-stretch",new=True, **kwargs
+        self, language, global_config=None, override=None, base_image=DEFAULT_BASE_IMAGE, new=True, **kwargs
     ):
         if global_config:  # TODO: pop from kwargs
             self._global_config = global_config.config_path
         self.language = language
-        self.base_image = base_image
+        # migrate the unused default of older configs to the image the Dockerfile was always built from
+        self.base_image = DEFAULT_BASE_IMAGE if base_image == LEGACY_DEFAULT_BASE_IMAGE else base_image
         self.config_path = f'{os.getcwd()}/'
         self.project_path = f'{self.config_path}/konan_model/'
         self.build_path = kwargs.get("build_path", f'{self.config_path}.konan_build/')
         self.latest_built_image = kwargs.get('latest_built_image', None)
+        # {"base_image": ..., "digest": ...}, only valid as long as base_image is unchanged
+        self.pinned_base_image = kwargs.get('pinned_base_image', None)
 
         # TODO: make read only
         self.templates_dir = f'{Path(__file__).parent.absolute()}/.templates/{language}'
@@ -151,9 +156,10 @@ class LocalConfig:
             data = json.load(f)
         return data
 
-    def build_context(self):
+    def build_context(self, wheelhouse=None):
         """
         Copy all common and user-modified files from konan_model to build context, override existing.
+        Wheels of the optional wheelhouse directory are copied too, to install requirements from.
         """
         # make build directory if not exists
         if not os.path.exists(self.build_path):
@@ -165,14 +171,118 @@ class LocalConfig:
         # copy from konan_models to build path and override
         shutil.copytree(self.project_path, self.build_path, dirs_exist_ok=True)
 
-        # TODO: take base image
+        # refresh wheelhouse, the Dockerfile always expects the directory to exist
+        wheelhouse_path = f'{self.build_path}wheelhouse'
+        shutil.rmtree(wheelhouse_path, ignore_errors=True)
+        if wheelhouse:
+            shutil.copytree(wheelhouse, wheelhouse_path)
+        else:
+            os.mkdir(wheelhouse_path)
 
-    def build_image(self, image_tag):
+    @staticmethod
+    def split_image_reference(image_ref):
+        """
+        Split an image reference into its repository, tag and digest,
+        ex: "localhost:5000/python:3.7@sha256:abc" -> ("localhost:5000/python", "3.7", "sha256:abc")
+        """
+        name, _, digest = image_ref.partition('@')
+        repository, _, tag = name.rpartition(':')
+        if not repository or '/' in tag:
+            repository, tag = name, None
+        return repository, tag, digest or None
+
+    @property
+    def base_image_digest(self):
+        """
+        Digest the base image is pinned to, either by base_image itself or by a pin made for the same base_image
+        """
+        _, _, digest = self.split_image_reference(self.base_image)
+        if digest:
+            return digest
+        if self.pinned_base_image and self.pinned_base_image.get('base_image') == self.base_image:
+            return self.pinned_base_image.get('digest')
+        return None
+
+    @property
+    def has_stale_pin(self):
+        return bool(self.pinned_base_image) and self.pinned_base_image.get('base_image') != self.base_image
+
+    def unpin_base_image(self):
+        self.pinned_base_image = None
+
+    def base_image_reference(self, registry_mirror=None):
+        """
+        Reference of the base image to build from, pinned to its digest if available.
+        Docker Hub images are pulled through the registry mirror if given, images of other registries are left as is.
+        """
+        repository, tag, _ = self.split_image_reference(self.base_image)
+        if registry_mirror:
+            first_component, _, remainder = repository.partition('/')
+            if first_component in ('docker.io', 'registry-1.docker.io'):
+                repository = remainder
+                first_component = repository.partition('/')[0]
+            is_docker_hub = '/' not in repository or not (
+                '.' in first_component or ':' in first_component or first_component == 'localhost'
+            )
+            if is_docker_hub:
+                if '/' not in repository:
+                    # official docker hub images live under library/
+                    repository = f'library/{repository}'
+                repository = f"{registry_mirror.rstrip('/')}/{repository}"
+
+        digest = self.base_image_digest
+        if digest:
+            return f'{repository}@{digest}'
+        return f'{repository}:{tag}' if tag else repository
+
+    def resolve_base_image(self, registry_mirror=None, pin=False, offline=False):
+        """
+        Make sure the base image is available locally, pulling it only if missing, and optionally pin its digest.
+        Pinning resolves the digest the registry currently serves for the tag, or the digest of the local image when
+        offline. Images pulled once are reused by the builds of all models sharing the same base image.
+        """
+        client = docker.from_env()
+        if pin and not offline and not self.base_image_digest:
+            registry_data = client.images.get_registry_data(self.base_image_reference(registry_mirror))
+            self.pinned_base_image = {'base_image': self.base_image, 'digest': registry_data.id}
+
+        image_ref = self.base_image_reference(registry_mirror)
+        try:
+            image = client.images.get(image_ref)
+        except ImageNotFound:
+            if offline:
+                raise
+            image = client.images.pull(image_ref)
+
+        if pin and not self.base_image_digest:
+            # offline, fall back to the digest of the local image, locally built images have none
+            repository, _, _ = self.split_image_reference(image_ref)
+            repo_digests = image.attrs.get('RepoDigests') or []
+            digest = None
+            for repo_digest in repo_digests:
+                if repo_digest.startswith(f'{repository}@'):
+                    digest = repo_digest.split('@', 1)[1]
+                    break
+            else:
+                if repo_digests:
+                    digest = repo_digests[0].split('@', 1)[1]
+            if digest:
+                self.pinned_base_image = {'base_image': self.base_image, 'digest': digest}
+                image_ref = self.base_image_reference(registry_mirror)
+        return image_ref
+
+    def build_image(self, image_tag, base_image=None, wheelhouse=None):
         """
         Build docker image
         """
+        buildargs = {}
+        if base_image:
+            buildargs['base_image'] = base_image
+        if wheelhouse:
+            buildargs['pip_install_args'] = '--no-index --find-links /build/wheelhouse'
+
         client = docker.from_env()
-        image, build_logs = client.images.build(path=self.build_path, tag=image_tag)
+        image, build_logs = client.images.build(path=self.build_path, tag=image_tag, buildargs=buildargs)
         return image, build_logs
 
     def stop_and_remove_container(self, container):